@@ -21,14 +21,34 @@ with DAG(
     catchup=False
 ) as dag:
 
-    update_task = BashOperator(
-        task_id='run_update_script',
-        bash_command='cd /opt/airflow/project/scripts && python update.py',
-        env={
-            'TARGET_YEAR': '2025',
-            'DB_HOST': os.getenv('DB_HOST', 'db'),
-            'GENIUS_ACCESS_TOKEN': os.getenv('GENIUS_ACCESS_TOKEN')
-        }
+    # Common environment for every step of the pipeline
+    task_env = {
+        'TARGET_YEAR': '2025',
+        'DB_HOST': os.getenv('DB_HOST', 'db'),
+        'GENIUS_ACCESS_TOKEN': os.getenv('GENIUS_ACCESS_TOKEN')
+    }
+
+    # Network-bound steps share a wide pool, the database step a narrow one
+    # (pools are created at container start, see docker-compose.yaml)
+    scrape_task = BashOperator(
+        task_id='scrape_snep',
+        bash_command='cd /opt/airflow/project/scripts && python update.py scrape',
+        env=task_env,
+        pool='network_pool'
+    )
+
+    enrich_task = BashOperator(
+        task_id='fetch_genius',
+        bash_command='cd /opt/airflow/project/scripts && python update.py enrich',
+        env=task_env,
+        pool='network_pool'
+    )
+
+    load_task = BashOperator(
+        task_id='load_to_db',
+        bash_command='cd /opt/airflow/project/scripts && python update.py load',
+        env=task_env,
+        pool='db_pool'
     )
 
-    update_task
+    scrape_task >> enrich_task >> load_task
@@ -1,6 +1,8 @@
 import os
-import psycopg2
-from flask import Flask, jsonify, request
+import threading
+from psycopg2 import extensions, pool
+from psycopg2.extras import RealDictCursor
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -12,65 +14,87 @@ load_dotenv(dotenv_path)
 app = Flask(__name__)
 CORS(app)
 
+# top_singles is partitioned by year and indexed for ILIKE searches
+# (see scripts/insert_record.py).
+# Lookups are prepared once per connection so Postgres parses and plans them only once.
+LOOKUP_QUERY = """
+    SELECT
+        titre,
+        COUNT(*) as weeks_in_top,
+        MIN(classement) as best_rank
+    FROM top_singles
+    WHERE {where_clause}
+    GROUP BY titre
+    ORDER BY weeks_in_top DESC
+"""
+PREPARED_STATEMENTS = {
+    'artist_lookup': LOOKUP_QUERY.format(where_clause="artiste ILIKE $1"),
+    'producer_lookup': LOOKUP_QUERY.format(where_clause="(producer_1 ILIKE $1 OR producer_2 ILIKE $1)"),
+}
+
+class PreparedConnection(extensions.connection):
+    """psycopg2 connection remembering whether the lookup statements are prepared"""
+    statements_prepared = False
+
+    def prepare_statements(self):
+        with self.cursor() as cur:
+            for name, query in PREPARED_STATEMENTS.items():
+                cur.execute(f"PREPARE {name}(text) AS {query}")
+        self.commit()
+        self.statements_prepared = True
+
+# Connections are pooled and reused across requests instead of paying
+# a full connect/auth handshake on every call
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = pool.ThreadedConnectionPool(
+                    1, 20,
+                    host=os.getenv('DB_HOST', 'localhost'),
+                    database=os.getenv('POSTGRES_DB', 'db'),
+                    user=os.getenv('POSTGRES_USER', 'db_user'),
+                    password=os.getenv('POSTGRES_PASSWORD', 'db_password'),
+                    port=os.getenv('DB_PORT', '5432'),
+                    connection_factory=PreparedConnection
+                )
+    return _db_pool
+
 def get_db_connection():
-    conn = psycopg2.connect(
-        host=os.getenv('DB_HOST', 'localhost'),
-        database=os.getenv('POSTGRES_DB', 'db'),
-        user=os.getenv('POSTGRES_USER', 'db_user'),
-        password=os.getenv('POSTGRES_PASSWORD', 'db_password'),
-        port=os.getenv('DB_PORT', '5432')
-    )
-    return conn
+    """Borrows a pooled connection for the duration of the current request"""
+    if 'db_conn' not in g:
+        g.db_conn = get_db_pool().getconn()
+        if not g.db_conn.statements_prepared:
+            g.db_conn.prepare_statements()
+    return g.db_conn
+
+@app.teardown_appcontext
+def release_db_connection(exception):
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        # End the read transaction so the connection goes back to the pool clean;
+        # drop it instead if the server closed it
+        if not conn.closed:
+            conn.rollback()
+        get_db_pool().putconn(conn, close=bool(conn.closed))
 
 @app.route('/api/artist/<artist_name>', methods=['GET'])
 def get_artist_stats(artist_name):
     try:
         conn = get_db_connection()
-        cur = conn.cursor()
-        
-        # Construct the query to union all tables from 2020 to 2026
-        years = range(2020, 2027) 
-        
-        union_parts = []
-        for year in years:
-            # Select producer columns to allow filtering by them
-            union_parts.append(f"SELECT titre, classement, artiste, producer_1, producer_2 FROM top_singles_{year}")
-            
-        union_query = " UNION ALL ".join(union_parts)
+        cur = conn.cursor(cursor_factory=RealDictCursor)
         
         search_type = request.args.get('type', 'artist')
         
-        if search_type == 'producer':
-            where_clause = "(producer_1 ILIKE %s OR producer_2 ILIKE %s)"
-            params = (f'%{artist_name}%', f'%{artist_name}%')
-        else:
-            where_clause = "artiste ILIKE %s"
-            params = (f'%{artist_name}%',)
-        
-        query = f"""
-            SELECT 
-                titre,
-                COUNT(*) as weeks_in_top,
-                MIN(classement) as best_rank
-            FROM ({union_query}) as all_years
-            WHERE {where_clause}
-            GROUP BY titre
-            ORDER BY weeks_in_top DESC;
-        """
-        
-        cur.execute(query, params)
-        rows = cur.fetchall()
-        
-        results = []
-        for row in rows:
-            results.append({
-                'titre': row[0],
-                'weeks_in_top': row[1],
-                'best_rank': row[2]
-            })
-            
+        statement = 'producer_lookup' if search_type == 'producer' else 'artist_lookup'
+        cur.execute(f"EXECUTE {statement}(%s)", (f'%{artist_name}%',))
+        # RealDictCursor yields {'titre', 'weeks_in_top', 'best_rank'} rows directly
+        results = cur.fetchall()
         cur.close()
-        conn.close()
         
         return jsonify({
             'artist': artist_name,
@@ -0,0 +1,35 @@
+"""
+Song cache keys and JSON helpers shared by update_data, scrap and debug_cache_v2
+(importing this module has no side effect: no logging setup, no environment loading)
+"""
+
+import json
+import re
+from functools import lru_cache
+
+# orjson (much faster on the large song and scrape caches) when installed, standard json otherwise
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:
+    json_loads = json.loads
+    def json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+# Punctuation removed from titles and artists in cache keys
+NON_WORD_RE = re.compile(r'[^\w\s]')
+# Deletion table equivalent to NON_WORD_RE for ASCII characters
+ASCII_DELETE_TABLE = {c: None for c in range(128) if NON_WORD_RE.match(chr(c))}
+
+def normalize(text):
+    """Removes punctuation (str.translate for ASCII text, regex otherwise)"""
+    text = text.lower().strip()
+    if text.isascii():
+        return text.translate(ASCII_DELETE_TABLE)
+    return NON_WORD_RE.sub('', text)
+
+@lru_cache(maxsize=32768)
+def get_key(title, artist):
+    """Normalizes title and artist to create a unique key (memoized: songs recur across weeks)"""
+    return f"{normalize(title)}|{normalize(artist)}"
@@ -1,25 +1,27 @@
 
-import json
-import re
 import os
+from collections import defaultdict
+# Same normalisation and keys as the cache written by update_data
+from cache_keys import get_key, json_loads, normalize
 
 CACHE_FILE = "../song_cache_v2.json"
 
-def get_key(title, artist):
-    """Normalise titre et artiste pour créer une clé unique"""
-    title_clean = re.sub(r'[^\w\s]', '', title.lower().strip())
-    artist_clean = re.sub(r'[^\w\s]', '', artist.lower().strip())
-    return f"{title_clean}|{artist_clean}"
-
 if not os.path.exists(CACHE_FILE):
     print(f"File not found: {CACHE_FILE}")
     exit(1)
 
-with open(CACHE_FILE, 'r', encoding='utf-8') as f:
-    cache = json.load(f)
+# Loaded with orjson when installed (like the project caches), standard json otherwise
+with open(CACHE_FILE, 'rb') as f:
+    cache = json_loads(f.read())
 
 print(f"Cache size: {len(cache)}")
 
+# Inverted index: title word -> cache keys containing that word
+title_index = defaultdict(set)
+for k in cache:
+    for token in k.split('|', 1)[0].split():
+        title_index[token].add(k)
+
 # Test case from logs
 title = "NE REVIENS PAS"
 artist = "GRADUR"
@@ -30,7 +32,8 @@ if key in cache:
     print("✅ Found in cache")
 else:
     print("❌ Not found in cache")
-    # Try to find partial matches
-    for k in cache.keys():
-        if "ne reviens pas" in k:
-            print(f"Partial match: '{k}'")
+    # Try to find partial matches (keys whose title contains every word of the title)
+    tokens = normalize(title).split()
+    candidates = set.intersection(*(title_index.get(t, set()) for t in tokens)) if tokens else set()
+    for k in sorted(candidates):
+        print(f"Partial match: '{k}'")
@@ -1,8 +1,12 @@
-import psycopg2
-from psycopg2 import sql
-import pandas as pd
+from psycopg2 import errors, pool, sql
+import csv
+import io
 import os
 import logging
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 
 # Logging configuration
@@ -24,103 +28,324 @@ DB_CONFIG = {
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 
+# Table partitionnée par année (une partition top_singles_YYYY par année)
+TABLE_NAME = "top_singles"
+
+# Colonnes insérées (doivent correspondre aux clés des dictionnaires et à la table)
+COLUMNS = [
+    'classement', 'artiste', 'artiste_2', 'artiste_3', 'artiste_4',
+    'titre', 'editeur', 'annee', 'semaine',
+    'producer_1', 'producer_2', 'writer_1', 'writer_2',
+    'release_date', 'sample_type', 'sample_from'
+]
+# Extraction des valeurs d'une ligne dans l'ordre des colonnes (niveau C)
+ROW_GETTER = itemgetter(*COLUMNS)
+COLUMN_DEFAULTS = dict.fromkeys(COLUMNS)
+# Colonnes INTEGER de la table (les autres sont TEXT)
+INTEGER_COLUMNS = {'classement', 'annee', 'semaine'}
+
+# Format binaire du COPY : en-tête, nombre de champs par ligne, NULL et fin de flux
+BINARY_COPY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+BINARY_COPY_FIELD_COUNT = struct.pack('!h', len(COLUMNS))
+BINARY_COPY_NULL = struct.pack('!i', -1)
+BINARY_COPY_TRAILER = struct.pack('!h', -1)
+
+DB_POOL_SIZE = 4
+
+# Pool de connexions partagé par toutes les fonctions du module (créé à la première utilisation)
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def get_db_pool():
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = pool.ThreadedConnectionPool(1, DB_POOL_SIZE, **DB_CONFIG)
+    return _db_pool
+
 def get_db_connection():
-    """Establishes a connection to the PostgreSQL database"""
+    """Borrows a connection to the PostgreSQL database from the pool"""
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        return conn
+        return get_db_pool().getconn()
     except Exception as e:
         logger.error(f"Erreur de connexion à la base de données: {e}")
         raise
 
-def create_table_for_year(year):
-    """Creates the table for a specific year if it does not exist"""
-    table_name = f"top_singles_{year}"
-    
-    create_table_query = sql.SQL("""
-        CREATE TABLE IF NOT EXISTS {} (
-            id SERIAL PRIMARY KEY,
-            classement INTEGER,
-            artiste TEXT,
-            artiste_2 TEXT,
-            artiste_3 TEXT,
-            artiste_4 TEXT,
-            titre TEXT,
-            editeur TEXT,
-            annee INTEGER,
-            semaine INTEGER,
-            producer_1 TEXT,
-            producer_2 TEXT,
-            writer_1 TEXT,
-            writer_2 TEXT,
-            release_date TEXT,
-            sample_type TEXT,
-            sample_from TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            UNIQUE(annee, semaine, classement)
-        );
-    """).format(sql.Identifier(table_name))
-    
-    conn = get_db_connection()
-    cur = conn.cursor()
-    try:
-        cur.execute(create_table_query)
-        conn.commit()
-        logger.info(f"Table {table_name} vérifiée/créée avec succès.")
-    except Exception as e:
-        conn.rollback()
-        logger.error(f"Erreur lors de la création de la table {table_name}: {e}")
-    finally:
-        cur.close()
-        conn.close()
+def release_db_connection(conn):
+    """Returns a connection to the pool (dropping it if the server closed it)"""
+    get_db_pool().putconn(conn, close=bool(conn.closed))
 
-def insert_record(data_list, year):
+def encode_binary_integer(value):
+    """Encode un champ INTEGER du COPY binaire (longueur puis entier big-endian)"""
+    return struct.pack('!ii', 4, int(value))
+
+def encode_binary_text(value):
+    """Encode un champ TEXT du COPY binaire (longueur puis octets UTF-8)"""
+    data = str(value).encode('utf-8')
+    return struct.pack('!i', len(data)) + data
+
+# Encodeur de chaque colonne, dans l'ordre de COLUMNS
+BINARY_FIELD_ENCODERS = tuple(
+    encode_binary_integer if column in INTEGER_COLUMNS else encode_binary_text
+    for column in COLUMNS
+)
+
+def create_table(conn):
     """
-    Insère une liste de dictionnaires dans la table de l'année correspondante.
-    Utilisé par update.py pour les nouvelles données.
+    Creates the partitioned parent table and its search indexes if they do not exist.
+    Trigram indexes speed up the API's ILIKE searches on artists and producers;
+    being declared on the parent, every partition gets them.
     """
-    # S'assurer que la table existe (même si pas de données)
-    create_table_for_year(year)
+    with conn.cursor() as cur:
+        cur.execute(sql.SQL("""
+            CREATE TABLE IF NOT EXISTS {} (
+                id SERIAL,
+                classement INTEGER,
+                artiste TEXT,
+                artiste_2 TEXT,
+                artiste_3 TEXT,
+                artiste_4 TEXT,
+                titre TEXT,
+                editeur TEXT,
+                annee INTEGER,
+                semaine INTEGER,
+                producer_1 TEXT,
+                producer_2 TEXT,
+                writer_1 TEXT,
+                writer_2 TEXT,
+                release_date TEXT,
+                sample_type TEXT,
+                sample_from TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (annee, semaine, classement)
+            ) PARTITION BY RANGE (annee);
+        """).format(sql.Identifier(TABLE_NAME)))
+        cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in ('artiste', 'producer_1', 'producer_2'):
+            cur.execute(sql.SQL("CREATE INDEX IF NOT EXISTS {} ON {} USING gin ({} gin_trgm_ops)").format(
+                sql.Identifier(f"{TABLE_NAME}_{column}_trgm"), sql.Identifier(TABLE_NAME), sql.Identifier(column)
+            ))
+
+# Table parente vérifiée une seule fois par processus (voir ensure_table)
+_table_ready = False
+_table_lock = threading.Lock()
 
-    if not data_list:
+def ensure_table():
+    """
+    Creates the parent table and its indexes once per process, in their own transaction,
+    and migrates every yearly table that predates the partitioning along with it,
+    so that queries on the parent table see all years from the start.
+    When the table already exists no DDL is sent at all: even CREATE INDEX IF NOT EXISTS
+    would hold a ShareLock on the table and every partition until commit.
+    """
+    global _table_ready
+    if _table_ready:
         return
+    with _table_lock:
+        if _table_ready:
+            return
+        conn = get_db_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT to_regclass(%s)", (TABLE_NAME,))
+                table_exists = cur.fetchone()[0] is not None
+            if not table_exists:
+                create_table(conn)
+                with conn.cursor() as cur:
+                    for year in get_legacy_table_years(cur):
+                        attach_legacy_table(cur, year)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_db_connection(conn)
+        _table_ready = True
 
-    table_name = f"top_singles_{year}"
-    
-    conn = get_db_connection()
-    cur = conn.cursor()
+def get_year_table_state(cur, year):
+    """
+    Returns the state of the table of a year: None if it does not exist, True for a partition
+    of the parent table, False for a standalone table (created before the partitioning)
+    """
+    cur.execute("SELECT relispartition FROM pg_class WHERE oid = to_regclass(%s)", (f"{TABLE_NAME}_{year}",))
+    row = cur.fetchone()
+    return None if row is None else row[0]
+
+def get_legacy_table_years(cur):
+    """Returns the years of the standalone tables (created before the partitioning), in order"""
+    cur.execute("""
+        SELECT relname FROM pg_class
+        WHERE relkind = 'r' AND NOT relispartition AND pg_table_is_visible(oid) AND relname ~ %s
+        ORDER BY relname
+    """, (f"^{TABLE_NAME}_[0-9]{{4}}$",))
+    return [int(relname.rsplit('_', 1)[1]) for relname, in cur.fetchall()]
+
+def attach_legacy_table(cur, year):
+    """
+    Migrates the standalone table of a year (id SERIAL PRIMARY KEY, UNIQUE (annee, semaine, classement))
+    into a partition: its own constraints are dropped, the partition key is made NOT NULL,
+    then ATTACH PARTITION checks its rows against the year's range and builds the parent's indexes.
+    """
+    table_name = f"{TABLE_NAME}_{year}"
+    table = sql.Identifier(table_name)
     
-    # Colonnes attendues (doivent correspondre aux clés du dictionnaire et à la table)
-    columns = [
-        'classement', 'artiste', 'artiste_2', 'artiste_3', 'artiste_4',
-        'titre', 'editeur', 'annee', 'semaine', 
-        'producer_1', 'producer_2', 'writer_1', 'writer_2', 
-        'release_date', 'sample_type', 'sample_from'
-    ]
+    cur.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u')",
+        (table_name,)
+    )
+    for constraint, in cur.fetchall():
+        cur.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(table, sql.Identifier(constraint)))
+    cur.execute(sql.SQL(
+        "ALTER TABLE {} ALTER COLUMN annee SET NOT NULL, ALTER COLUMN semaine SET NOT NULL, "
+        "ALTER COLUMN classement SET NOT NULL"
+    ).format(table))
+    cur.execute(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM ({}) TO ({})").format(
+        sql.Identifier(TABLE_NAME), table, sql.Literal(year), sql.Literal(year + 1)
+    ))
+    logger.info(f"Table {table_name} rattachée comme partition de {TABLE_NAME}.")
+
+def create_table_for_year(year, conn):
+    """
+    Creates the partition for a specific year (and the parent table) if it does not exist,
+    or migrates the year's table if it predates the partitioning.
+    The partition DDL joins the caller's transaction (the caller commits, and handles errors).
+    """
+    ensure_table()
+    with conn.cursor() as cur:
+        state = get_year_table_state(cur, year)
+        if state is None:
+            cur.execute(sql.SQL("CREATE TABLE {} PARTITION OF {} FOR VALUES FROM ({}) TO ({})").format(
+                sql.Identifier(f"{TABLE_NAME}_{year}"), sql.Identifier(TABLE_NAME),
+                sql.Literal(year), sql.Literal(year + 1)
+            ))
+        elif not state:
+            attach_legacy_table(cur, year)
+
+def insert_record(data_list, year):
+    """
+    Insère une liste de dictionnaires dans la partition de l'année correspondante.
+    Utilisé par update.py pour les nouvelles données.
+    """
+    table_name = f"{TABLE_NAME}_{year}"
     
-    # Construction de la requête INSERT dynamique
-    insert_query = sql.SQL("INSERT INTO {} ({}) VALUES ({}) ON CONFLICT (annee, semaine, classement) DO NOTHING").format(
-        sql.Identifier(table_name),
-        sql.SQL(', ').join(map(sql.Identifier, columns)),
-        sql.SQL(', ').join(sql.Placeholder() * len(columns))
+    # Flux COPY binaire : le serveur n'a aucun texte à analyser (entiers, NULL)
+    chunks = [BINARY_COPY_HEADER]
+    # Les dictionnaires incomplets (enrichissement échoué) sont complétés avec None
+    complete_items = (
+        item if item.keys() >= COLUMN_DEFAULTS.keys() else {**COLUMN_DEFAULTS, **item}
+        for item in data_list
     )
+    for values in map(ROW_GETTER, complete_items):
+        chunks.append(BINARY_COPY_FIELD_COUNT)
+        chunks.extend(
+            BINARY_COPY_NULL if value is None else encode(value)
+            for encode, value in zip(BINARY_FIELD_ENCODERS, values)
+        )
+    chunks.append(BINARY_COPY_TRAILER)
+    buffer = io.BytesIO(b''.join(chunks))
     
-    inserted_count = 0
+    # Création de la table et insertion dans une seule transaction
+    conn = get_db_connection()
     try:
-        for item in data_list:
-            # Préparer les valeurs dans l'ordre des colonnes, avec gestion des None
-            values = [item.get(col) for col in columns]
-            cur.execute(insert_query, values)
-            inserted_count += 1
-        
+        # S'assurer que la partition existe (même si pas de données)
+        create_table_for_year(year, conn)
+        inserted_count = copy_into_table(conn, buffer, COLUMNS) if data_list else 0
         conn.commit()
         logger.info(f"Inséré {inserted_count} enregistrements dans {table_name}.")
     except Exception as e:
         conn.rollback()
         logger.error(f"Erreur lors de l'insertion dans {table_name}: {e}")
     finally:
-        cur.close()
-        conn.close()
+        release_db_connection(conn)
+
+# Requêtes de chargement déjà rendues en SQL, par (colonnes, NULL ou binaire, année en mode bulk)
+_copy_statements_cache = {}
+
+def compose_copy_statements(columns, null, bulk_year):
+    """
+    Compose les requêtes du chargement :
+    création de la table temporaire, COPY, puis insertion dans la table partitionnée
+    (ou, en mode bulk, construction puis rattachement de la partition de l'année).
+    null est le marqueur NULL d'un flux CSV ; None pour un flux COPY binaire.
+    """
+    table = sql.Identifier(TABLE_NAME)
+    staging = sql.Identifier(f"staging_{TABLE_NAME}")
+    column_list = sql.SQL(', ').join(map(sql.Identifier, columns))
+    
+    if null is None:
+        copy_options = sql.SQL("FORMAT binary")
+    else:
+        copy_options = sql.SQL("FORMAT csv, NULL {}").format(sql.Literal(null))
+    
+    # file_order numérote les lignes dans l'ordre du flux : en cas de doublon,
+    # les deux modes gardent la première ligne du fichier
+    statements = [
+        sql.SQL(
+            "CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {} WITH NO DATA; "
+            "ALTER TABLE {} ADD COLUMN file_order BIGINT GENERATED ALWAYS AS IDENTITY"
+        ).format(staging, column_list, table, staging),
+        sql.SQL("COPY {} ({}) FROM STDIN WITH ({})").format(staging, column_list, copy_options),
+    ]
+    if bulk_year is None:
+        # Le planificateur route chaque ligne vers la partition de son année
+        statements.append(sql.SQL(
+            "INSERT INTO {} ({}) SELECT {} FROM {} ORDER BY file_order "
+            "ON CONFLICT (annee, semaine, classement) DO NOTHING"
+        ).format(table, column_list, column_list, staging))
+        return statements
+    
+    # La partition est remplie hors de la table parente, sans index : ATTACH PARTITION
+    # construit ensuite ses index (clé primaire, trigrammes) en un seul passage
+    partition = sql.Identifier(f"{TABLE_NAME}_{bulk_year}")
+    statements.append(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS)").format(partition, table))
+    statements.append(sql.SQL(
+        "INSERT INTO {} ({}) SELECT DISTINCT ON (annee, semaine, classement) {} FROM {} "
+        "ORDER BY annee, semaine, classement, file_order"
+    ).format(partition, column_list, column_list, staging))
+    statements.append(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM ({}) TO ({})").format(
+        table, partition, sql.Literal(bulk_year), sql.Literal(bulk_year + 1)
+    ))
+    return statements
+
+def get_copy_statements(conn, columns, null, bulk_year):
+    """Rend les requêtes de chargement une seule fois, puis les réutilise"""
+    key = (tuple(columns), null, bulk_year)
+    statements = _copy_statements_cache.get(key)
+    if statements is None:
+        statements = tuple(
+            query.as_string(conn) for query in compose_copy_statements(columns, null, bulk_year)
+        )
+        _copy_statements_cache[key] = statements
+    return statements
+
+def copy_into_table(conn, stream, columns, null=None, bulk_year=None):
+    """
+    Envoie des lignes CSV, ou un flux COPY binaire si null est None (objet fichier),
+    dans la table partitionnée en ignorant les doublons.
+    COPY n'a pas d'ON CONFLICT : on charge une table temporaire en un seul flux,
+    puis un unique INSERT ... SELECT applique la déduplication.
+    En mode bulk (chargement initial d'une année sans partition), la partition est construite
+    à part puis rattachée : ses index sont créés en un seul passage au lieu d'être mis à jour
+    ligne par ligne.
+    Retourne le nombre de lignes insérées (le commit est laissé à l'appelant).
+    """
+    create_staging, copy, *load = get_copy_statements(conn, columns, null, bulk_year)
+    
+    with conn.cursor() as cur:
+        cur.execute(create_staging)
+        cur.copy_expert(copy, stream)
+        if bulk_year is None:
+            insert, = load
+            cur.execute(insert)
+            return cur.rowcount
+        
+        create_partition, insert, attach_partition = load
+        cur.execute(create_partition)
+        cur.execute(insert)
+        inserted_count = cur.rowcount
+        cur.execute(attach_partition)
+        return inserted_count
 
 def load_csvs_to_db():
     """Charge tous les fichiers CSV du dossier data/ dans la base de données"""
@@ -130,54 +355,85 @@ def load_csvs_to_db():
         logger.warning("Aucun fichier CSV trouvé dans le dossier data/")
         return
 
-    for csv_file in csv_files:
+    # Table parente créée avant les workers pour éviter des CREATE concurrents
+    ensure_table()
+
+    # Chaque année a sa propre partition : les fichiers sont chargés en parallèle,
+    # une connexion du pool par worker (le temps est passé dans libpq, hors GIL)
+    with ThreadPoolExecutor(max_workers=min(len(csv_files), DB_POOL_SIZE)) as executor:
+        list(executor.map(load_csv_year, csv_files))
+
+def load_csv_year(csv_file):
+    """Charge le fichier CSV d'une année, en journalisant les erreurs sans interrompre les autres"""
+    try:
+        # Extraire l'année du nom de fichier (top_singles_2025.csv -> 2025)
+        year = int(csv_file.stem.split('_')[-1])
+        logger.info(f"Traitement du fichier {csv_file.name} pour l'année {year}...")
+        load_csv_file(csv_file, year)
+    except Exception as e:
+        logger.error(f"Erreur lors du traitement de {csv_file.name}: {e}")
+
+def load_csv_file(csv_file, year):
+    """
+    Envoie un fichier CSV tel quel au COPY, sans passer par un DataFrame.
+    Les colonnes sont celles de l'en-tête du fichier (les colonnes non enrichies restent NULL).
+    """
+    table_name = f"{TABLE_NAME}_{year}"
+    
+    # Octets transmis tels quels (UTF-8) ; seul l'en-tête est décodé (utf-8-sig : BOM du scraper)
+    with open(csv_file, 'rb') as f:
+        header = next(csv.reader([f.readline().decode('utf-8-sig')]), [])
+        if not header:
+            logger.warning(f"Fichier {csv_file.name} vide, ignoré.")
+            return
+        unknown_columns = set(header) - set(COLUMNS)
+        if unknown_columns:
+            raise ValueError(f"Colonnes inattendues: {', '.join(sorted(unknown_columns))}")
+        
+        conn = get_db_connection()
         try:
-            # Extraire l'année du nom de fichier (top_singles_2025.csv -> 2025)
-            year = int(csv_file.stem.split('_')[-1])
-            logger.info(f"Traitement du fichier {csv_file.name} pour l'année {year}...")
-            
-            # Lire le CSV avec pandas pour gérer facilement les NaN
-            df = pd.read_csv(csv_file)
-            
-            # Remplacer les NaN par None (pour SQL NULL)
-            df = df.where(pd.notnull(df), None)
-            
-            # Convertir en liste de dictionnaires
-            data_list = df.to_dict('records')
-            
-            # Insérer dans la base
-            insert_record(data_list, year)
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du traitement de {csv_file.name}: {e}")
+            with conn.cursor() as cur:
+                # Chargement rejouable depuis le CSV : le commit n'attend pas le fsync du WAL
+                cur.execute("SET LOCAL synchronous_commit = off")
+                state = get_year_table_state(cur, year)
+                # Table d'avant le partitionnement : migrée, puis complétée comme une partition
+                if state is False:
+                    attach_legacy_table(cur, year)
+            # Les champs vides non quotés (NaN côté pandas) deviennent NULL ;
+            # mode bulk si la partition de l'année n'existe pas encore
+            inserted_count = copy_into_table(
+                conn, f, header, '', bulk_year=year if state is None else None
+            )
+            conn.commit()
+            logger.info(f"Inséré {inserted_count} enregistrements dans {table_name}.")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            release_db_connection(conn)
 
 def get_last_scraped_week(year):
     """Récupère la dernière semaine présente en base pour une année donnée"""
-    table_name = f"top_singles_{year}"
-    
-    # Vérifier si la table existe d'abord
     conn = get_db_connection()
     cur = conn.cursor()
-    
-    # Vérifier l'existence de la table
-    cur.execute("SELECT to_regclass(%s)", (table_name,))
-    if cur.fetchone()[0] is None:
-        cur.close()
-        conn.close()
-        return 0 # Table n'existe pas, donc semaine 0
-        
     try:
-        query = sql.SQL("SELECT MAX(semaine) FROM {}").format(sql.Identifier(table_name))
+        # Un seul aller-retour, sur la table de l'année : sa partition, ou sa table d'avant
+        # le partitionnement tant qu'elle n'est pas migrée ; une table absente est signalée par UndefinedTable
+        query = sql.SQL("SELECT COALESCE(MAX(semaine), 0) FROM {}").format(
+            sql.Identifier(f"{TABLE_NAME}_{year}")
+        )
         cur.execute(query)
-        result = cur.fetchone()
-        last_week = result[0] if result and result[0] is not None else 0
-        return last_week
+        return cur.fetchone()[0]
+    except errors.UndefinedTable:
+        conn.rollback()
+        return 0 # Table n'existe pas, donc semaine 0
     except Exception as e:
+        conn.rollback()
         logger.error(f"Erreur lors de la récupération de la dernière semaine pour {year}: {e}")
         return 0
     finally:
         cur.close()
-        conn.close()
+        release_db_connection(conn)
 
 if __name__ == "__main__":
     # Si exécuté directement, charger les CSV existants
@@ -0,0 +1,36 @@
+"""
+Request pacing and cache writing shared by scrap and update_data
+"""
+
+import os
+import threading
+import time
+
+
+class RequestPacer:
+    """Spaces request starts by interval seconds, whatever the number of threads"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_request_time = 0.0
+
+    def wait(self):
+        """Blocks until the next request may start"""
+        with self._lock:
+            now = time.monotonic()
+            if self._next_request_time > now:
+                time.sleep(self._next_request_time - now)
+                now = self._next_request_time
+            self._next_request_time = now + self.interval
+
+
+def write_atomic(path, data):
+    """
+    Writes bytes to a temporary file then renames it over path,
+    so a crash never leaves a truncated file
+    """
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, path)
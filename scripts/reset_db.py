@@ -33,13 +33,16 @@ def reset_database():
     
     years = range(2020, 2027)
     
-    for year in years:
-        table_name = f"top_singles_{year}"
-        try:
-            cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name)))
-            logger.info(f"Table {table_name} supprimée.")
-        except Exception as e:
-            logger.error(f"Erreur lors de la suppression de {table_name}: {e}")
+    # Un seul aller-retour : la table partitionnée et les tables annuelles
+    # (partitions, ou tables séparées d'un ancien schéma)
+    table_names = ["top_singles"] + [f"top_singles_{year}" for year in years]
+    try:
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(
+            sql.SQL(', ').join(map(sql.Identifier, table_names))
+        ))
+        logger.info(f"Tables {', '.join(table_names)} supprimées.")
+    except Exception as e:
+        logger.error(f"Erreur lors de la suppression des tables: {e}")
             
     conn.commit()
     cur.close()
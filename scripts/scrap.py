@@ -5,16 +5,29 @@ Scraper to retrieve Top Singles data from SNEP Musique
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
-import time
+import importlib.util
 import os
+from pathlib import Path
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 import logging
-from datetime import datetime
+from datetime import date
 import re
+from functools import lru_cache
 import urllib3
-import json
+from operator import itemgetter
+
+# orjson when installed, standard json otherwise (same helpers as the Genius song cache)
+from cache_keys import json_dumps, json_loads
+from io_helpers import RequestPacer, write_atomic
+
+# C-backed lxml parser when installed, pure-Python parser otherwise
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
 
 # Disable insecure SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -26,8 +39,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of newly scraped weeks after which the cache is written to disk
+CACHE_SAVE_EVERY = 16
+
+# Only the chart items are parsed when the page uses SNEP's standard markup
+CHART_ITEMS_STRAINER = SoupStrainer('article', class_='classement-item')
+
+# --- Regular expressions (compiled once, at import time) ---
+
+# Artist names
+FEAT_ARTISTS_SPLIT_RE = re.compile(r'\s*[&,]\s*')
+X_SEPARATOR_RE = re.compile(r'\b([A-Z][A-Za-z\s]+?)\s+X\s+([A-Z][A-Za-z\s]+?)\b')
+LONG_NUMBER_RE = re.compile(r'\d{3,}')
+STOPWORDS_RE = re.compile(r'\b(THE|AND|OF|FOR|WITH|IN|ON|AT)\b', re.IGNORECASE)
+# Every artist separator except X, split in a single pass:
+# - FT/FEAT (case insensitive): \s+ ensures at least one space before,
+#   (?:\.|\b) matches a dot OR a word boundary, \s* matches optional space after.
+# - & and comma, with the spaces before them. The spaces after are left
+#   (stripped with each artist) so that a following " FT" still matches.
+ARTIST_SEPARATOR_RE = re.compile(r'\s+(?:FT|FEAT)(?:\.|\b)\s*|\s*[&,]', re.IGNORECASE)
+
+# Titles
+PARENTHESES_RE = re.compile(r'\(([^)]+)\)')
+FEAT_MENTION_RE = re.compile(r'\b(feat\.?|ft\.?|featuring)\b', re.IGNORECASE)
+FEAT_ARTISTS_RE = re.compile(r'\b(?:feat\.?|ft\.?|featuring)\s+(.+)', re.IGNORECASE)
+PARENTHESES_STRIP_RE = re.compile(r'\s*\([^)]*\)\s*')
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Page content
+NUMBER_RE = re.compile(r'(\d+)')
+RANKING_LINE_RE = re.compile(r'^(\d{1,3})$')
+RANKING_BLOCK_TEXT_RE = re.compile(r'^\d+$|^\d+e?La Semaine', re.I)
+# Navigation and metadata lines (also covers last week's positions, "3e La Semaine")
+SKIP_LINE_RE = re.compile(r'semaine|nouveau|télécharger|pdf|précédente|suivante', re.IGNORECASE)
+PREVIOUS_RANK_OR_NEW_RE = re.compile(r'^(\d+e?La Semaine|Nouveau)', re.I)
+
+# Class names of the page elements
+BLOCK_CLASS_RE = re.compile(r'(item|single|track|classement)', re.I)
+TITLE_CLASS_RE = re.compile(r'(title|titre|song|track)', re.I)
+ARTIST_CLASS_RE = re.compile(r'(artist|artiste|performer)', re.I)
+EDITOR_CLASS_RE = re.compile(r'(label|editeur|publisher|producer)', re.I)
+# Rank elements, excluding previous week's rank, matched by the selector engine in one pass
+RANK_CANDIDATES_SELECTOR = (
+    ':is(span, div, strong)'
+    ':is([class*=rank i], [class*=position i], [class*=classement i], [class*=number i])'
+    ':not([class*=precedent i], [class*=previous i], [class*=last i])'
+)
+
+# Project paths (resolved once, at import time)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / 'data'
+CACHE_FILE = PROJECT_ROOT / 'snep_scrap_cache.json'
+
+# Columns of the yearly CSV files
+CSV_FIELDNAMES = ('classement', 'artiste', 'artiste_2', 'artiste_3', 'artiste_4', 'titre', 'editeur', 'annee', 'semaine')
+# Values of an entry in the order of the columns (extracted at C level)
+CSV_ROW_GETTER = itemgetter(*CSV_FIELDNAMES)
+
 # --- Parsing utility functions (extracted for modularity and testing) ---
 
+# Artist columns, in order
+ARTIST_KEYS = ('artiste', 'artiste_2', 'artiste_3', 'artiste_4')
+
 def parse_artists_in_feat(artistes_text):
     """
     Parse artists in a feat. (can contain &, commas, etc.)
@@ -35,114 +108,132 @@ def parse_artists_in_feat(artistes_text):
     if not artistes_text:
         return []
     
+    # Single artist (no & nor comma): nothing to split
+    if '&' not in artistes_text and ',' not in artistes_text:
+        artiste = artistes_text.strip()
+        return [artiste] if artiste else []
+    
     # Split by & and commas
-    artistes = re.split(r'\s*[&,]\s*', artistes_text)
+    artistes = FEAT_ARTISTS_SPLIT_RE.split(artistes_text)
     return [a.strip() for a in artistes if a.strip()]
 
 def handle_x_separator(text):
     """
     Smartly handles X as an artist separator
     """
-    # Pattern to detect an X surrounded by spaces between words that look like names
+    # X_SEPARATOR_RE detects an X surrounded by spaces between words that look like names
     # We look for: [Word(s)] X [Word(s)] where words start with a capital letter
-    x_pattern = r'\b([A-Z][A-Za-z\s]+?)\s+X\s+([A-Z][A-Za-z\s]+?)\b'
+    # Most strings have no uppercase X at all: skip the (backtracking) regex for them
+    if 'X' not in text:
+        return text
     
     def replace_x(match):
         artist1 = match.group(1).strip()
         artist2 = match.group(2).strip()
         
-        # Additional checks to ensure they are artist names
+        # Additional checks to ensure they are artist names, cheapest first
         # Avoid replacing if words are too short or contain suspicious characters
-        if (len(artist1) >= 2 and len(artist2) >= 2 and 
-            not re.search(r'\d{3,}', artist1 + artist2) and  # Avoid long numbers
-            not re.search(r'\b(THE|AND|OF|FOR|WITH|IN|ON|AT)\b', artist1 + " " + artist2, re.IGNORECASE)):
-            return f"{artist1}|SEPARATOR|{artist2}"
-        else:
-            # Return original text if it doesn't look like artist names
+        # (return original text if it doesn't look like artist names)
+        if len(artist1) < 2 or len(artist2) < 2:
+            return match.group(0)
+        
+        # Both names can only contain letters and spaces, so joining them with a space
+        # does not change what the digit check finds
+        combined = f"{artist1} {artist2}"
+        if LONG_NUMBER_RE.search(combined):  # Avoid long numbers
             return match.group(0)
+        if STOPWORDS_RE.search(combined):
+            return match.group(0)
+        
+        return f"{artist1}|SEPARATOR|{artist2}"
     
-    return re.sub(x_pattern, replace_x, text)
+    return X_SEPARATOR_RE.sub(replace_x, text)
 
-def parse_artists(artiste_string):
+@lru_cache(maxsize=4096)
+def split_artists(artiste_string):
     """
-    Separates multiple artists based on delimiters: comma, FEAT., &, X (smart)
+    Splits an artist string on comma, FEAT., &, X (smart)
+    Memoized: the same artists come back week after week on the charts.
     
     Args:
         artiste_string: String potentially containing multiple artists
         
     Returns:
-        Dict with artiste, artiste_2, artiste_3, artiste_4
+        Tuple of at most 4 artists
     """
-    result = {
-        'artiste': '',
-        'artiste_2': '',
-        'artiste_3': '',
-        'artiste_4': ''
-    }
-    
     if not artiste_string or artiste_string.strip() == '':
-        return result
+        return ()
     
     # Clean the string
     cleaned_string = artiste_string.strip()
     
-    # Replace different separators with a uniform separator
-    # We use |SEPARATOR| as a unique temporary delimiter
-    
-    # Pattern for FT/FEAT (case insensitive)
-    # \s+ ensures at least one space before.
-    # (?:FT|FEAT) matches the keyword.
-    # (?:\.|\b) matches a dot OR a word boundary.
-    # \s* matches optional space after.
-    pattern_feat = r'\s+(?:FT|FEAT)(?:\.|\b)\s*'
-    cleaned_string = re.sub(pattern_feat, '|SEPARATOR|', cleaned_string, flags=re.IGNORECASE)
-    
-    # Pattern for & (surrounded by optional spaces)
-    cleaned_string = re.sub(r'\s*&\s*', '|SEPARATOR|', cleaned_string)
-    
-    # Pattern for comma
-    cleaned_string = re.sub(r'\s*,\s*', '|SEPARATOR|', cleaned_string)
-    
-    # Smart handling of X as separator
-    cleaned_string = handle_x_separator(cleaned_string)
+    # Single artist (the common case): none of the separators can match
+    upper_string = cleaned_string.upper()
+    if ('&' not in cleaned_string and ',' not in cleaned_string and 'X' not in cleaned_string
+            and 'FT' not in upper_string and 'FEAT' not in upper_string):
+        return (cleaned_string,)
+    
+    # Split on FT/FEAT, & and comma in one pass, then on X (smart) inside each part
+    # (an X pair never spans those separators, so this matches handling the whole string)
+    artists = [
+        artist.strip()
+        for part in ARTIST_SEPARATOR_RE.split(cleaned_string)
+        for artist in handle_x_separator(part).split('|SEPARATOR|')
+        if artist.strip()
+    ]
+    
+    # Maximum 4 artists
+    return tuple(artists[:4])
+
+def parse_artists(artiste_string):
+    """
+    Separates multiple artists based on delimiters: comma, FEAT., &, X (smart)
     
-    # Split by uniform delimiter
-    artists = [artist.strip() for artist in cleaned_string.split('|SEPARATOR|') if artist.strip()]
+    Args:
+        artiste_string: String potentially containing multiple artists
+        
+    Returns:
+        Dict with artiste, artiste_2, artiste_3, artiste_4
+        (a new dict on each call: merge_artists fills it in place)
+    """
+    result = dict.fromkeys(ARTIST_KEYS, '')
     
     # Assign to columns
-    keys = ['artiste', 'artiste_2', 'artiste_3', 'artiste_4']
-    for i, artist in enumerate(artists[:4]):  # Maximum 4 artists
-        if i < len(keys):
-            result[keys[i]] = artist
+    result.update(zip(ARTIST_KEYS, split_artists(artiste_string)))
     
     return result
 
+@lru_cache(maxsize=4096)
 def clean_title_and_extract_feat(titre):
     """
     Cleans the title by removing parentheses and extracts feat. artists.
+    Memoized, so the result is immutable.
     
     Args:
         titre: Original title
         
     Returns:
-        Tuple (clean_title, list_feat_artists)
+        Tuple (clean_title, tuple_feat_artists)
     """
     if not titre:
-        return titre, []
+        return titre, ()
     
     titre_propre = titre.strip()
+    
+    # Most titles have no parentheses: skip the feat. search, only normalize spaces
+    if '(' not in titre_propre:
+        return WHITESPACE_RE.sub(' ', titre_propre), ()
+    
     artistes_feat = []
     
     # Search for content inside parentheses
-    parentheses_pattern = r'\(([^)]+)\)'
-    matches = re.findall(parentheses_pattern, titre_propre)
+    matches = PARENTHESES_RE.findall(titre_propre)
     
     for match in matches:
         # Check if it is a feat.
-        if re.search(r'\b(feat\.?|ft\.?|featuring)\b', match, re.IGNORECASE):
+        if FEAT_MENTION_RE.search(match):
             # Extract artists after feat.
-            feat_pattern = r'\b(?:feat\.?|ft\.?|featuring)\s+(.+)'
-            feat_match = re.search(feat_pattern, match, re.IGNORECASE)
+            feat_match = FEAT_ARTISTS_RE.search(match)
             if feat_match:
                 artistes_text = feat_match.group(1).strip()
                 # Separate artists in the feat.
@@ -150,70 +241,91 @@ def clean_title_and_extract_feat(titre):
                 artistes_feat.extend(artistes_dans_feat)
     
     # Remove all parentheses from the title
-    titre_propre = re.sub(r'\s*\([^)]*\)\s*', ' ', titre_propre)
-    titre_propre = re.sub(r'\s+', ' ', titre_propre).strip()
+    titre_propre = PARENTHESES_STRIP_RE.sub(' ', titre_propre)
+    titre_propre = WHITESPACE_RE.sub(' ', titre_propre).strip()
     
-    return titre_propre, artistes_feat
+    return titre_propre, tuple(artistes_feat)
 
 def merge_artists(artists_data, feat_artists):
     """
     Merges main artists with feat. artists without duplicates
     """
-    # Collect all existing artists
-    existing_artists = []
-    for key in ['artiste', 'artiste_2', 'artiste_3', 'artiste_4']:
-        if artists_data[key]:
-            existing_artists.append(artists_data[key].upper())
+    # Collect all existing artists (uppercased once, for O(1) lookups)
+    existing_artists = {artists_data[key].upper() for key in ARTIST_KEYS if artists_data[key]}
+    
+    # Empty columns, filled in order
+    free_keys = iter([key for key in ARTIST_KEYS if not artists_data[key]])
     
     # Add feat. artists if they are not already present
-    keys = ['artiste', 'artiste_2', 'artiste_3', 'artiste_4']
     for feat_artist in feat_artists:
-        if feat_artist.upper() not in existing_artists:
-            # Find the next empty column
-            for key in keys:
-                if not artists_data[key]:
-                    artists_data[key] = feat_artist
-                    existing_artists.append(feat_artist.upper())
-                    break
+        feat_artist_upper = feat_artist.upper()
+        if feat_artist_upper in existing_artists:
+            continue
+        
+        # Next empty column (stop once all columns are filled)
+        key = next(free_keys, None)
+        if key is None:
+            break
+        artists_data[key] = feat_artist
+        existing_artists.add(feat_artist_upper)
     
     return artists_data
 
 # --- Fin des fonctions utilitaires ---
 
 class SNEPScraper:
-    def __init__(self, delay_between_requests=1.5):
+    def __init__(self, delay_between_requests=1.5, max_workers=4):
         """
         Initializes the SNEP scraper
         
         Args:
-            delay_between_requests: Delay in seconds between each request
+            delay_between_requests: Delay in seconds between each request of a worker
+            max_workers: Number of weeks fetched concurrently by scrape_year
         """
         self.base_url = "https://snepmusique.com/les-tops/le-top-de-la-semaine/top-albums/"
         self.delay = delay_between_requests
+        self.max_workers = max_workers
+        # Request pacing shared by all workers: one request start every delay / max_workers seconds,
+        # so that the overall request rate stays at max_workers requests per delay
+        self.request_pacer = RequestPacer(self.delay / self.max_workers)
         self.session = requests.Session()
         # Disable SSL verification to avoid local certificate errors
         self.session.verify = False
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # Keep-alive connections reused across weeks, with retries and backoff on transient errors
+        # (requests already asks for gzip/deflate responses and keeps connections alive)
+        retries = Retry(
+            total=3,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         # Create data folder if it doesn't exist
-        self.data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
-        if not os.path.exists(self.data_dir):
-            os.makedirs(self.data_dir)
+        self.data_dir = DATA_DIR
+        if not self.data_dir.is_dir():
+            self.data_dir.mkdir(parents=True, exist_ok=True)
             logger.info(f"Folder '{self.data_dir}' created")
 
         # Cache initialization
-        self.cache_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'snep_scrap_cache.json')
+        self.cache_file = CACHE_FILE
         self.cache = self.load_cache()
+        # Guards the cache between the scrape_year workers and the periodic saves
+        self._cache_lock = threading.Lock()
+        self._unsaved_weeks = 0
 
     def load_cache(self):
         """Loads cache from JSON file"""
-        if os.path.exists(self.cache_file):
+        if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                with open(self.cache_file, 'rb') as f:
                     logger.info(f"Loading cache from {self.cache_file}")
-                    return json.load(f)
+                    return json_loads(f.read())
             except Exception as e:
                 logger.error(f"Error loading cache: {e}")
                 return {}
@@ -222,8 +334,12 @@ class SNEPScraper:
     def save_cache(self):
         """Saves cache to JSON file"""
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            with self._cache_lock:
+                # Nothing to write if no week was scraped since the cache was loaded or last saved
+                if not self._unsaved_weeks:
+                    return
+                write_atomic(self.cache_file, json_dumps(self.cache))
+                self._unsaved_weeks = 0
             logger.info("Cache updated")
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
@@ -252,7 +368,7 @@ class SNEPScraper:
             annee: Year
             
         Returns:
-            BeautifulSoup object or None if error
+            (BeautifulSoup object, raw page content), or (None, None) if error
         """
         params = {
             'categorie': 'Top Singles',
@@ -261,15 +377,22 @@ class SNEPScraper:
         }
         
         try:
+            self.request_pacer.wait()
             logger.info(f"Retrieving data: Year {annee}, Week {semaine}")
             response = self.session.get(self.base_url, params=params, timeout=10)
             response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
+            
+            # Build the tree of the chart items only (navigation, ads and footer are skipped);
+            # pages with another layout are parsed in full for the other extraction strategies
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=CHART_ITEMS_STRAINER)
+            if soup.find('article'):
+                return soup, response.content
+            return BeautifulSoup(response.content, HTML_PARSER), response.content
         except requests.exceptions.RequestException as e:
             logger.error(f"Error retrieving page (Year {annee}, Week {semaine}): {e}")
-            return None
+            return None, None
     
-    def extract_data_from_page(self, soup, semaine, annee):
+    def extract_data_from_page(self, soup, semaine, annee, page_content=None):
         """
         Extracts data from the page
         
@@ -277,6 +400,8 @@ class SNEPScraper:
             soup: BeautifulSoup object
             semaine: Week number
             annee: Year
+            page_content: Raw page content, parsed in full for the text-based extraction
+                when soup only holds the chart items
             
         Returns:
             List of dictionaries containing the data
@@ -309,12 +434,11 @@ class SNEPScraper:
                     items = []
                     
                     # Pattern to identify ranking blocks
-                    classement_blocks = main_content.find_all(['div', 'article'], 
-                                                             class_=re.compile(r'(item|single|track|classement)', re.I))
+                    classement_blocks = main_content.find_all(['div', 'article'], class_=BLOCK_CLASS_RE)
                     
                     for block in classement_blocks:
                         # Check if it is indeed a ranking item
-                        if block.find(text=re.compile(r'^\d+$|^\d+e?La Semaine', re.I)):
+                        if block.find(text=RANKING_BLOCK_TEXT_RE):
                             items.append(block)
             
             logger.info(f"Number of items found: {len(items)}")
@@ -331,25 +455,16 @@ class SNEPScraper:
                     classement_elem = item.find('div', class_='rang')
                     if classement_elem:
                         classement_text = classement_elem.get_text(strip=True)
-                        match = re.search(r'(\d+)', classement_text)
+                        match = NUMBER_RE.search(classement_text)
                         if match:
                             classement = match.group(1)
 
-                    # PRIORITY 2: If not found, search with regex but excluding "precedent"
+                    # PRIORITY 2: If not found, search classes matching rank/position/etc...
+                    # excluding "precedent", "previous" and "last"
                     if not classement:
-                        # Search for classes matching rank/position/etc...
-                        candidates = item.find_all(['span', 'div', 'strong'], class_=re.compile(r'(rank|position|classement|number)', re.I))
-                        
-                        for candidate in candidates:
-                            # Check that class does not contain "precedent" or "previous"
-                            classes = candidate.get('class', [])
-                            class_str = " ".join(classes).lower()
-                            
-                            if 'precedent' in class_str or 'previous' in class_str or 'last' in class_str:
-                                continue
-                                
+                        for candidate in item.select(RANK_CANDIDATES_SELECTOR):
                             classement_text = candidate.get_text(strip=True)
-                            match = re.search(r'(\d+)', classement_text)
+                            match = NUMBER_RE.search(classement_text)
                             if match:
                                 classement = match.group(1)
                                 break
@@ -357,7 +472,7 @@ class SNEPScraper:
                     if not classement:
                         # Search in item text (fallback)
                         text = item.get_text(strip=True)
-                        match = re.match(r'^(\d+)', text)
+                        match = NUMBER_RE.match(text)
                         if match:
                             classement = match.group(1)
                     
@@ -366,12 +481,9 @@ class SNEPScraper:
                     # These information can be in different tags
                     
                     # Method 1: Search for specific tags
-                    titre_elem = item.find(['h2', 'h3', 'h4', 'h5', 'span', 'div'], 
-                                          class_=re.compile(r'(title|titre|song|track)', re.I))
-                    artiste_elem = item.find(['span', 'div', 'p'], 
-                                            class_=re.compile(r'(artist|artiste|performer)', re.I))
-                    editeur_elem = item.find(['span', 'div', 'p'], 
-                                            class_=re.compile(r'(label|editeur|publisher|producer)', re.I))
+                    titre_elem = item.find(['h2', 'h3', 'h4', 'h5', 'span', 'div'], class_=TITLE_CLASS_RE)
+                    artiste_elem = item.find(['span', 'div', 'p'], class_=ARTIST_CLASS_RE)
+                    editeur_elem = item.find(['span', 'div', 'p'], class_=EDITOR_CLASS_RE)
                     
                     titre = titre_elem.get_text(strip=True) if titre_elem else None
                     artiste = artiste_elem.get_text(strip=True) if artiste_elem else None
@@ -379,18 +491,12 @@ class SNEPScraper:
                     
                     # Method 2: If not found, try to parse full text
                     if not all([titre, artiste, editeur]):
-                        # Get all text and split intelligently
-                        lines = []
-                        for elem in item.find_all(text=True):
-                            text = elem.strip()
-                            if text and not re.match(r'^(\d+e?La Semaine|Nouveau)', text, re.I):
-                                lines.append(text)
-                        
-                        # Filter lines to remove ranking and week info
-                        filtered_lines = []
-                        for line in lines:
-                            if not re.match(r'^\d+$', line) and len(line) > 2:
-                                filtered_lines.append(line)
+                        # Stream the item's stripped text and filter it in the same pass:
+                        # remove ranking (digits only, like ^\d+$) and week info
+                        filtered_lines = [
+                            text for text in item.stripped_strings
+                            if len(text) > 2 and not text.isdecimal() and not PREVIOUS_RANK_OR_NEW_RE.match(text)
+                        ]
                         
                         # Generally: Title, Artist, Label
                         if len(filtered_lines) >= 3:
@@ -436,6 +542,9 @@ class SNEPScraper:
             # try text-based extraction
             if len(data) == 0:
                 logger.info("Attempting alternative text-based extraction...")
+                # A soup with articles only holds the chart items: the text is searched in the full page
+                if page_content is not None and soup.find('article'):
+                    soup = BeautifulSoup(page_content, HTML_PARSER)
                 data = self.extract_data_from_text(soup, semaine, annee)
             
             logger.info(f"Number of entries extracted: {len(data)}")
@@ -452,19 +561,20 @@ class SNEPScraper:
         data = []
         
         try:
-            # Get all text from the page
-            text_content = soup.get_text()
-            
-            # Split into lines and clean
-            lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-            
-            # Pattern to identify a ranking number
-            classement_pattern = re.compile(r'^(\d{1,3})$')
+            # Walk the page's text nodes (already stripped, empty ones skipped)
+            # instead of joining the whole page into one string and splitting it;
+            # a node spanning several lines is still split into lines
+            lines = [
+                line.strip()
+                for text in soup.stripped_strings
+                for line in text.split('\n')
+                if line.strip()
+            ]
             
             i = 0
             while i < len(lines):
                 # Search for a ranking number
-                if classement_pattern.match(lines[i]):
+                if RANKING_LINE_RE.match(lines[i]):
                     classement = lines[i]
                     
                     # Following lines should be title, artist, label
@@ -476,13 +586,11 @@ class SNEPScraper:
                     collected_lines = []
                     
                     # Collect next lines until next ranking or indicator
-                    while j < len(lines) and not classement_pattern.match(lines[j]):
+                    while j < len(lines) and not RANKING_LINE_RE.match(lines[j]):
                         line = lines[j]
-                        # Ignore navigation and metadata lines
-                        if not any(skip in line.lower() for skip in ['semaine', 'nouveau', 'télécharger', 'pdf', 'précédente', 'suivante']):
-                            # Also ignore last week's positions
-                            if not re.match(r'^\d+e?La Semaine', line, re.I):
-                                collected_lines.append(line)
+                        # Ignore navigation and metadata lines, and last week's positions
+                        if not SKIP_LINE_RE.search(line):
+                            collected_lines.append(line)
                         j += 1
                     
                     # Assign collected lines
@@ -526,40 +634,36 @@ class SNEPScraper:
         
         return data
     
-    def save_to_csv(self, data, annee):
+    def get_csv_path(self, annee):
+        """Returns the path of the CSV file of a year"""
+        return self.data_dir / f"top_singles_{annee}.csv"
+    
+    def open_csv_writer(self, annee):
         """
-        Saves data to a CSV file
+        Opens a temporary CSV file for a year and writes its header
         
         Args:
-            data: List of dictionaries containing the data
             annee: Year for the filename
-        """
-        if not data:
-            logger.warning(f"No data to save for year {annee}")
-            return
-        
-        filename = os.path.join(self.data_dir, f"top_singles_{annee}.csv")
-        
-        try:
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                fieldnames = ['classement', 'artiste', 'artiste_2', 'artiste_3', 'artiste_4', 'titre', 'editeur', 'annee', 'semaine']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for row in data:
-                    writer.writerow(row)
             
-            logger.info(f"Data saved in {filename} ({len(data)} entries)")
-        except Exception as e:
-            logger.error(f"Error saving CSV: {e}")
+        Returns:
+            Tuple (open file, csv.writer); the caller closes the file, renames it
+            to get_csv_path(annee) once complete, and writes rows ordered as
+            CSV_FIELDNAMES (see CSV_ROW_GETTER)
+        """
+        tmp_file = f"{self.get_csv_path(annee)}.tmp"
+        csvfile = open(tmp_file, 'w', newline='', encoding='utf-8-sig')
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_FIELDNAMES)
+        return csvfile, writer
     
-    def scrape_week(self, annee, semaine):
+    def scrape_week(self, annee, semaine, fetch_missing=True):
         """
         Scrapes a specific week and returns the data (without saving to CSV)
         
         Args:
             annee: Year to scrape
             semaine: Week to scrape
+            fetch_missing: If False, only the cache is used (no request to SNEP)
             
         Returns:
             List of dictionaries containing the data
@@ -571,23 +675,29 @@ class SNEPScraper:
             logger.info(f"Data retrieved from cache for Year {annee}, Week {semaine}")
             return self.cache[cache_key]
 
+        if not fetch_missing:
+            logger.info(f"Year {annee}, Week {semaine} : Not in cache")
+            return []
+
         logger.info(f"Retrieving data: Year {annee}, Week {semaine}")
         
-        soup = self.get_page_content(semaine, annee)
+        soup, page_content = self.get_page_content(semaine, annee)
         if not soup:
             logger.warning(f"✗ Year {annee}, Week {semaine} : No data found (Request error)")
             return []
             
-        data = self.extract_data_from_page(soup, semaine, annee)
+        data = self.extract_data_from_page(soup, semaine, annee, page_content)
         
         if data:
             logger.info(f"✓ Year {annee}, Week {semaine} : {len(data)} entries retrieved")
-            # Update cache
-            self.cache[cache_key] = data
-            # Save cache periodically (here after each successful week to avoid losing everything)
-            # To optimize, we could save less often, but this is safer.
-            # self.save_cache() -> Can be done at the end of the year or here. 
-            # Let's do it here for now to be safe.
+            # Update cache, and save it every CACHE_SAVE_EVERY new weeks
+            # (callers also save it at the end of each year / run)
+            with self._cache_lock:
+                self.cache[cache_key] = data
+                self._unsaved_weeks += 1
+                save_now = self._unsaved_weeks >= CACHE_SAVE_EVERY
+            if save_now:
+                self.save_cache()
             return data
         else:
             logger.warning(f"✗ Year {annee}, Week {semaine} : No data found")
@@ -601,36 +711,64 @@ class SNEPScraper:
             annee: Year to scrape
             semaine_debut: First week to scrape
             semaine_fin: Last week to scrape
+            
+        Returns:
+            Number of entries retrieved for the year
         """
         logger.info(f"Starting scraping for year {annee} (weeks {semaine_debut} to {semaine_fin})")
-        all_data = []
+        nb_entries = 0
         semaines_manquantes = []
+        csvfile = writer = None
         
-        for semaine in range(semaine_debut, semaine_fin + 1):
-            data = self.scrape_week(annee, semaine)
-            
-            if data:
-                all_data.extend(data)
+        # Weeks are fetched concurrently; get_page_content paces the requests
+        # (cached weeks don't wait). map keeps the results in week order.
+        semaines = range(semaine_debut, semaine_fin + 1)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(lambda semaine: self.scrape_week(annee, semaine), semaines)
+                for semaine, data in zip(semaines, results):
+                    if not data:
+                        semaines_manquantes.append(semaine)
+                        continue
+                    nb_entries += len(data)
+                    
+                    # Each week is written to the CSV as soon as it is available
+                    # (the file is only created once there is data for the year)
+                    try:
+                        if csvfile is None:
+                            csvfile, writer = self.open_csv_writer(annee)
+                        if writer:
+                            writer.writerows(map(CSV_ROW_GETTER, data))
+                            csvfile.flush()
+                    except Exception as e:
+                        logger.error(f"Error saving CSV: {e}")
+                        writer = None
+        finally:
+            if csvfile:
+                csvfile.close()
+        
+        # The complete file replaces the previous one in one step, so an interrupted
+        # or failed run never leaves a partial CSV in its place
+        csv_path = self.get_csv_path(annee)
+        if csvfile:
+            if writer:
+                os.replace(csvfile.name, csv_path)
             else:
-                semaines_manquantes.append(semaine)
-            
-            # Pause between requests only if we didn't use cache
-            # If coming from cache, it's instant, no need to sleep
-            if f"{annee}_{semaine}" not in self.cache:
-                time.sleep(self.delay)
+                os.remove(csvfile.name)
         
         # Save cache at the end of the year to limit disk writes
         self.save_cache()
 
-        # Save all data for the year
-        if all_data:
-            self.save_to_csv(all_data, annee)
+        if writer:
+            logger.info(f"Data saved in {csv_path} ({nb_entries} entries)")
+        elif not nb_entries:
+            logger.warning(f"No data to save for year {annee}")
         
         # Log missing weeks
         if semaines_manquantes:
             logger.warning(f"Missing weeks for {annee}: {semaines_manquantes}")
         
-        return all_data
+        return nb_entries
     
     def clean_existing_csv_files(self):
         """
@@ -640,10 +778,10 @@ class SNEPScraper:
         deleted_files = []
         
         for year in years:
-            filename = os.path.join(self.data_dir, f"top_singles_{year}.csv")
-            if os.path.exists(filename):
+            filename = self.data_dir / f"top_singles_{year}.csv"
+            if filename.exists():
                 try:
-                    os.remove(filename)
+                    filename.unlink()
                     deleted_files.append(filename)
                     logger.info(f"File deleted: {filename}")
                 except Exception as e:
@@ -666,9 +804,7 @@ class SNEPScraper:
         # self.clean_existing_csv_files()
         
         # Dynamic calculation of current week
-        now = datetime.now()
-        current_year = now.year
-        current_week = now.isocalendar()[1]
+        current_year, current_week, _ = date.today().isocalendar()
         
         # Scrape current year (2025)
         if current_year == 2025:
@@ -676,20 +812,16 @@ class SNEPScraper:
             # Or up to current week if we want to try
             limit_week = current_week - 1 if current_week > 1 else 1
             
-            # For the requested test, force up to 45 if beyond, or use dynamic logic
-            # Here I respect the user's explicit request to go up to 45 for the test
-            limit_week = 45 
-            
             logger.info(f"Scraping current year {current_year} up to week {limit_week}")
-            data_2025 = self.scrape_year(2025, 1, limit_week)
-            logger.info(f"Total 2025 : {len(data_2025)} entries")
+            nb_entries_2025 = self.scrape_year(2025, 1, limit_week)
+            logger.info(f"Total 2025 : {nb_entries_2025} entries")
         
         # Scrape previous years only if necessary
         for year in range(2024, 2019, -1):
             # Force scraping even if file exists because we want to fix rankings
             logger.info(f"Starting scraping for {year}...")
-            data_year = self.scrape_year(year, 1, 52)
-            logger.info(f"Total {year} : {len(data_year)} entries")
+            nb_entries_year = self.scrape_year(year, 1, 52)
+            logger.info(f"Total {year} : {nb_entries_year} entries")
         
         logger.info("=" * 50)
         logger.info("Scraping finished!")
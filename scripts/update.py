@@ -1,6 +1,7 @@
 import logging
 import datetime
 import os
+import sys
 from scrap import SNEPScraper
 from update_data import GeniusDataEnricher
 from insert_record import insert_record, get_last_scraped_week
@@ -12,21 +13,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def enrich_data_list(data_list, enricher):
+def enrich_data_list(data_list, enricher, fetch_missing=True):
     """
     Enriches a list of dictionaries (SNEP data) with Genius data.
+    With fetch_missing=False only the Genius cache is used (no API calls).
     """
     enriched_count = 0
     total = len(data_list)
     
-    for i, item in enumerate(data_list, 1):
+    # Retrieve details via Genius (uses GeniusDataEnricher internal cache), several songs at a time
+    songs = [(item['titre'], item['artiste']) for item in data_list]
+    
+    for i, (item, song_details) in enumerate(zip(data_list, enricher.get_songs_details(songs, fetch_missing)), 1):
         try:
             # Progress log every 10 items
             if i % 10 == 0:
                 logger.info(f"Enrichissement en cours... {i}/{total}")
-
-            # Retrieve details via Genius (uses GeniusDataEnricher internal cache)
-            song_details = enricher.get_song_details(item['titre'], item['artiste'])
             
             # Merge data
             if song_details:
@@ -41,12 +43,16 @@ def enrich_data_list(data_list, enricher):
     logger.info(f"Enrichi {enriched_count}/{len(data_list)} entrées.")
     return data_list
 
-def update_database():
+# Pipeline steps, runnable separately (one Airflow task each).
+# The SNEP and Genius caches carry the data from one step to the next.
+STEPS = ('scrape', 'enrich', 'load')
+
+def update_database(steps=STEPS):
     """
     Main update function:
     1. Determine current week.
     2. Check last week in database.
-    3. Scrape, enrich and insert missing weeks.
+    3. Scrape, enrich and insert missing weeks (only the requested steps).
     """
     current_date = datetime.datetime.now()
     current_year = int(os.getenv("TARGET_YEAR", current_date.year))
@@ -57,7 +63,7 @@ def update_database():
     else:
         current_week = current_date.isocalendar()[1]
     
-    logger.info(f"Démarrage de la mise à jour. Année cible: {current_year}, Semaine cible: {current_week}")
+    logger.info(f"Démarrage de la mise à jour ({', '.join(steps)}). Année cible: {current_year}, Semaine cible: {current_week}")
     
     # Initialiser l'enrichisseur (charge le cache)
     enricher = GeniusDataEnricher()
@@ -85,29 +91,51 @@ def update_database():
         
         # 1. Scraping
         try:
-            raw_data = scraper.scrape_week(current_year, week)
+            # Sans l'étape scrape (tâches enrich/load), uniquement depuis le cache SNEP
+            raw_data = scraper.scrape_week(current_year, week, fetch_missing='scrape' in steps)
+            if not raw_data and 'scrape' not in steps:
+                # Semaine non scrapée : on s'arrête là, sinon les semaines suivantes
+                # seraient insérées et get_last_scraped_week la considérerait comme faite
+                logger.warning(f"Semaine {week} absente du cache SNEP. Arrêt.")
+                break
             if not raw_data:
                 logger.warning(f"Aucune donnée récupérée pour la semaine {week}. Arrêt ou passage à la suivante.")
                 continue
                 
             logger.info(f"Récupéré {len(raw_data)} entrées depuis SNEP.")
             
-            # 2. Enrichissement
-            enriched_data = enrich_data_list(raw_data, enricher)
+            if 'enrich' not in steps and 'load' not in steps:
+                continue
             
-            # 3. Insertion
-            insert_record(enriched_data, current_year)
+            # 2. Enrichissement (sur une copie pour ne pas polluer le cache SNEP) ;
+            # sans l'étape enrich (load seul, pool base de données), uniquement depuis le cache Genius
+            enriched_data = enrich_data_list(
+                [dict(item) for item in raw_data], enricher, fetch_missing='enrich' in steps
+            )
             
             # Sauvegarder le cache Genius périodiquement
             enricher.cache.save_cache()
             
+            # 3. Insertion
+            if 'load' in steps:
+                insert_record(enriched_data, current_year)
+            
         except Exception as e:
             logger.error(f"Erreur critique lors du traitement de la semaine {week}: {e}")
             # On continue pour essayer les autres semaines ? Ou on break ?
             # Mieux vaut continuer au cas où c'est juste une semaine qui bug.
             continue
 
+    # Persister le cache SNEP pour les étapes suivantes
+    if 'scrape' in steps:
+        scraper.save_cache()
+
     logger.info("Mise à jour terminée.")
 
 if __name__ == "__main__":
-    update_database()
+    # Usage: python update.py [scrape] [enrich] [load]  (toutes les étapes par défaut)
+    requested_steps = tuple(sys.argv[1:]) or STEPS
+    unknown_steps = set(requested_steps) - set(STEPS)
+    if unknown_steps:
+        sys.exit(f"Étapes inconnues: {', '.join(sorted(unknown_steps))} (attendu: {', '.join(STEPS)})")
+    update_database(requested_steps)
@@ -11,25 +11,32 @@ This script enriches the top music data with:
 """
 
 import pandas as pd
-import numpy as np
-import lyricsgenius
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
-import time
 import logging
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 try:
     from dotenv import load_dotenv
 except ImportError:
     load_dotenv = None
 
+from cache_keys import get_key, json_dumps, json_loads
+from io_helpers import RequestPacer, write_atomic
+
 # Configuration
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 CACHE_FILE = PROJECT_ROOT / "song_cache_v2.json"
+# Number of cache changes after which the cache is written to disk
+CACHE_SAVE_EVERY = int(os.getenv("GENIUS_CACHE_SAVE_EVERY", 500))
+# Columns of the yearly CSV files: SNEP chart data, then Genius data added by the update
+CHART_COLUMNS = ['classement', 'artiste', 'artiste_2', 'artiste_3', 'artiste_4', 'titre', 'editeur', 'annee', 'semaine']
+ENRICHED_COLUMNS = ['producer_1', 'producer_2', 'writer_1', 'writer_2', 'release_date', 'sample_type', 'sample_from']
 
 # Load environment variables
 if load_dotenv:
@@ -68,14 +75,18 @@ class OptimizedSongCache:
     def __init__(self, cache_file=CACHE_FILE):
         self.cache_file = cache_file
         self.cache = self.load_cache()
+        # Entries by Genius song id, to reuse details fetched under another title/artist spelling
+        # (entries written before song ids were stored have none and are not indexed)
+        self.by_song_id = {data["song_id"]: data for data in self.cache.values() if data.get("song_id")}
         self.stats = {"hits": 0, "misses": 0, "api_calls": 0}
         self.unsaved_changes = 0  # Counter for unsaved changes
+        self._lock = threading.Lock()  # Shared by the enrichment threads
 
     def load_cache(self):
         if os.path.exists(self.cache_file):
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.cache_file, 'rb') as f:
+                    return json_loads(f.read())
             except Exception as e:
                 logger.error(f"Error loading cache: {e}")
                 return {}
@@ -83,50 +94,82 @@ class OptimizedSongCache:
     
     def save_cache(self):
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
+            with self._lock:
+                # Nothing to write if the cache did not change since it was loaded or last saved
+                if not self.unsaved_changes:
+                    return
+                write_atomic(self.cache_file, json_dumps(self.cache))
+                self.unsaved_changes = 0
             logger.info(f"Cache saved: {len(self.cache)} entries")
         except Exception as e:
             logger.error(f"Error saving cache: {e}")
     
-    def get_key(self, title, artist):
-        """Normalizes title and artist to create a unique key"""
-        import re
-        title_clean = re.sub(r'[^\w\s]', '', title.lower().strip())
-        artist_clean = re.sub(r'[^\w\s]', '', artist.lower().strip())
-        return f"{title_clean}|{artist_clean}"
+    get_key = staticmethod(get_key)
     
     def get(self, title, artist):
         key = self.get_key(title, artist)
-        if key in self.cache:
-            self.stats["hits"] += 1
-            return self.cache[key]
-        self.stats["misses"] += 1
+        with self._lock:
+            if key in self.cache:
+                self.stats["hits"] += 1
+                return self.cache[key]
+            self.stats["misses"] += 1
         return None
     
     def set(self, title, artist, data):
         key = self.get_key(title, artist)
-        if key not in self.cache:
-            logger.debug(f"Adding to cache: {key}")
-        self.cache[key] = data
-        self.unsaved_changes += 1
-        
-        # Save every 10 changes
-        if self.unsaved_changes >= 10:
+        with self._lock:
+            if key not in self.cache:
+                logger.debug(f"Adding to cache: {key}")
+            self.cache[key] = data
+            if data.get("song_id"):
+                self.by_song_id[data["song_id"]] = data
+            self.unsaved_changes += 1
+            
+            # Save every CACHE_SAVE_EVERY changes
+            save_needed = self.unsaved_changes >= CACHE_SAVE_EVERY
+        if save_needed:
             self.save_cache()
-            self.unsaved_changes = 0
+    
+    def get_by_song_id(self, song_id):
+        with self._lock:
+            return self.by_song_id.get(song_id)
+    
+    def record_api_call(self):
+        with self._lock:
+            self.stats["api_calls"] += 1
 
 class GeniusDataEnricher:
     """Music data enricher via Genius API"""
     
-    def __init__(self):
-        self.genius = lyricsgenius.Genius(ACCESS_TOKEN)
-        self.genius.timeout = 20  # Increase timeout
-        self.genius.retries = 3   # Add retries
+    def __init__(self, max_workers=4, request_interval=0.1):
+        self.max_workers = max_workers  # Concurrent API requests
+        # Rate limiting shared by all workers: one API request start every request_interval seconds
+        self.request_pacer = RequestPacer(request_interval)
+        # Keep-alive connections to the API shared by all workers (one per worker; requests already
+        # asks for gzip/deflate responses), with back off and retry when the API is rate limiting
+        # (429, honoring Retry-After) or failing
+        self.session = requests.Session()
+        retries = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET'])
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({"Authorization": f"Bearer {ACCESS_TOKEN}"})
         self.cache = OptimizedSongCache()
-        
+    
     def get_song_details(self, title, artist):
         """Retrieves song details from Genius API"""
+        # Check cache first
+        cached_data = self.cache.get(title, artist)
+        if cached_data:
+            return cached_data
+        return self.fetch_song_details(title, artist)
+
+    def fetch_song_details(self, title, artist):
+        """Retrieves song details from Genius API, without looking at the cache"""
         song_data = {
             "producer_1": None, "producer_2": None,
             "writer_1": None, "writer_2": None,
@@ -136,21 +179,31 @@ class GeniusDataEnricher:
         }
 
         try:
-            # Check cache first
-            cached_data = self.cache.get(title, artist)
-            if cached_data:
-                return cached_data
-
-            # Search via API
-            song = self.genius.search_song(title, artist)
-            if not song:
+            # Search via API (only the song id is needed, so no lyrics page is downloaded)
+            self.request_pacer.wait()
+            r = self.session.get(f"{BASE_URL}/search", params={"q": f"{title} {artist}"}, timeout=20)
+            hits = r.json()["response"]["hits"] if r.status_code == 200 else []
+            songs = [hit["result"] for hit in hits if hit.get("type") == "song"]
+            if not songs:
                 self.cache.set(title, artist, song_data)
                 return song_data
 
-            song_id = song.to_dict()['id']
-            headers = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
+            # Prefer the hit by the charted artist, otherwise the best ranked one
+            artist_lower = artist.lower()
+            song = next(
+                (s for s in songs if s.get("primary_artist", {}).get("name", "").lower() == artist_lower),
+                songs[0]
+            )
+            song_id = song["id"]
             
-            r = requests.get(f"{BASE_URL}/songs/{song_id}", headers=headers, timeout=20)
+            # Same song already fetched under another title/artist spelling (in this run or a previous one)
+            known_data = self.cache.get_by_song_id(song_id)
+            if known_data:
+                self.cache.set(title, artist, known_data)
+                return known_data
+            
+            self.request_pacer.wait()
+            r = self.session.get(f"{BASE_URL}/songs/{song_id}", timeout=20)
             
             if r.status_code != 200:
                 self.cache.set(title, artist, song_data)
@@ -184,19 +237,61 @@ class GeniusDataEnricher:
                     song_data["sample_from"] = f"{title_s} - {artist_s}" if artist_s else title_s
                     break
 
-            # Save to cache
+            # Save to cache, with the song id so that other spellings of the song can reuse it
+            song_data["song_id"] = song_id
             self.cache.set(title, artist, song_data)
-            self.cache.stats["api_calls"] += 1
-            
-            # Rate limiting
-            time.sleep(0.1)
+            self.cache.record_api_call()
 
+        except (requests.exceptions.RetryError, requests.exceptions.ConnectionError) as e:
+            # Retries exhausted (rate limiting, API down): not cached, so the song is retried next run
+            logger.error(f"API unavailable for {title} - {artist}: {e}")
+            return song_data
         except Exception as e:
             logger.error(f"API Error for {title} - {artist}: {e}")
             self.cache.set(title, artist, song_data)
 
         return song_data
 
+    def get_songs_details(self, songs, fetch_missing=True):
+        """
+        Retrieves details for several (title, artist) pairs, in order
+        Cache hits are served right away, only the misses are fetched concurrently
+        (once per cache key, as the API would be asked twice for spellings mapping to one key);
+        with fetch_missing=False the API is never called and misses yield None
+        """
+        # One bad row (e.g. a NaN title from pandas) must not stop the others: it simply yields None,
+        # and is never fetched, as the API calls would be wasted on a row that cannot be cached
+        def lookup(song):
+            try:
+                return self.cache.get_key(*song), self.cache.get(*song)
+            except Exception:
+                return None, None
+        
+        def fetch_details(song):
+            try:
+                return self.fetch_song_details(*song)
+            except Exception as e:
+                logger.error(f"Error for {song}: {e}")
+                return None
+        
+        lookups = [(song, *lookup(song)) for song in songs]
+        
+        if not fetch_missing:
+            for _, _, song_data in lookups:
+                yield song_data
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetches = {}
+            for song, key, song_data in lookups:
+                if not song_data and key is not None and key not in fetches:
+                    fetches[key] = executor.submit(fetch_details, song)
+            for _, key, song_data in lookups:
+                if song_data or key is None:
+                    yield song_data
+                else:
+                    yield fetches[key].result()
+
 class DataUpdater:
     """Music data update manager"""
     
@@ -205,13 +300,22 @@ class DataUpdater:
         self.current_year = datetime.now().year
         self.current_week = datetime.now().isocalendar()[1]
         
+    def needs_enrichment(self, file_path):
+        """Checks if a yearly file has entries missing producer data (reads only that column)"""
+        producers = pd.read_csv(file_path, usecols=lambda col: col == 'producer_1')
+        return 'producer_1' not in producers.columns or producers['producer_1'].isna().any()
+    
     def load_yearly_data(self):
-        """Loads data for all available years"""
+        """Loads data for all available years that still have entries to enrich"""
         df_dict = {}
         
         for year in range(2020, self.current_year + 1):
             file_path = DATA_DIR / f"top_singles_{year}.csv"
             if file_path.exists():
+                # Fully enriched years (most of them, most days) are not loaded at all
+                if not self.needs_enrichment(file_path):
+                    logger.info(f"Year {year}: All entries are already enriched")
+                    continue
                 df_dict[str(year)] = pd.read_csv(file_path)
                 logger.info(f"Loaded: {len(df_dict[str(year)])} entries for {year}")
             else:
@@ -232,58 +336,80 @@ class DataUpdater:
         
         if not new_file_path.exists():
             # Create basic structure for the new year
-            sample_df = pd.DataFrame(columns=[
-                'classement', 'artiste', 'artiste_2', 'artiste_3', 'artiste_4',
-                'titre', 'editeur', 'annee', 'semaine', 'producer_1', 'producer_2',
-                'writer_1', 'writer_2', 'release_date', 'sample_type', 'sample_from'
-            ])
+            sample_df = pd.DataFrame(columns=CHART_COLUMNS + ENRICHED_COLUMNS)
             sample_df.to_csv(new_file_path, index=False)
             logger.info(f"File created for {next_year}: {new_file_path}")
     
     def update_all_data(self, df_dict):
         """Updates data for all years if necessary"""
         
-        required_columns = ['producer_1', 'producer_2', 'writer_1', 'writer_2', 'release_date', 'sample_type', 'sample_from']
-        
+        entries_by_year = {}
         for year_str, df in df_dict.items():
             logger.info(f"Processing year {year_str}: {len(df)} entries")
             
             # Check if enriched columns exist, otherwise create them
-            for col in required_columns:
-                if col not in df.columns:
-                    df[col] = None
+            # (as nullable strings, so that enriched values can be assigned even to
+            # columns that were read empty, hence as floats, from the CSV)
+            for col in ENRICHED_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('string')
+                else:
+                    df[col] = pd.Series(pd.NA, index=df.index, dtype='string')
             
-            # Identify entries to enrich (missing producer data)
-            entries_to_enrich = df[df['producer_1'].isna()]
+            # Identify entries to enrich (missing producer data), without copying the rows
+            to_enrich = df['producer_1'].isna().to_numpy()
+            index_to_enrich = df.index[to_enrich]
             
-            if len(entries_to_enrich) == 0:
+            if len(index_to_enrich) == 0:
                 logger.info(f"Year {year_str}: All entries are already enriched")
                 continue
                 
-            logger.info(f"Year {year_str}: Enriching {len(entries_to_enrich)} entries")
+            logger.info(f"Year {year_str}: Enriching {len(index_to_enrich)} entries")
+            songs_to_enrich = list(zip(df['titre'].to_numpy()[to_enrich], df['artiste'].to_numpy()[to_enrich]))
+            entries_by_year[year_str] = (index_to_enrich, songs_to_enrich)
+        
+        # A song charts for many weeks (sometimes over several years): enrich each (title, artist) once
+        songs = list(dict.fromkeys(
+            song
+            for _, songs_to_enrich in entries_by_year.values()
+            for song in songs_to_enrich
+        ))
+        if songs:
+            logger.info(f"Enriching {len(songs)} distinct songs")
+        
+        # Enrichment (Bug fix: API call if missing from cache)
+        # get_song_details handles Cache + API, several songs at a time
+        song_details = {}
+        for song, song_data in zip(songs, self.enricher.get_songs_details(songs)):
+            song_details[song] = song_data
+            processed = len(song_details)
+            
+            if processed % 100 == 0: # More frequent log to track progress
+                logger.info(f"Processed {processed}/{len(songs)} songs")
+        
+        for year_str, (index_to_enrich, songs_to_enrich) in entries_by_year.items():
+            df = df_dict[year_str]
             
-            # Enrichment (Bug fix: API call if missing from cache)
-            processed = 0
-            for idx, row in entries_to_enrich.iterrows():
-                try:
-                    # Call get_song_details which handles Cache + API
-                    song_data = self.enricher.get_song_details(row['titre'], row['artiste'])
-                    
-                    if song_data:
-                        for col, val in song_data.items():
-                            df.at[idx, col] = val
-                        processed += 1
-                        
-                    if processed % 100 == 0: # More frequent log to track progress
-                        logger.info(f"Year {year_str}: Processed {processed}/{len(entries_to_enrich)}")
-                        # Intermediate cache save to avoid losing everything in case of crash
-                        if processed % 500 == 0:
-                            self.enricher.cache.save_cache()
-                        
-                except Exception as e:
-                    logger.error(f"Error line {idx} year {year_str}: {e}")
+            enriched_index = []
+            enriched_rows = []
+            for idx, song in zip(index_to_enrich, songs_to_enrich):
+                song_data = song_details[song]
+                if song_data:
+                    enriched_index.append(idx)
+                    enriched_rows.append(song_data)
             
-            logger.info(f"Year {year_str}: Enriched {processed}/{len(entries_to_enrich)} entries")
+            # Write all enriched rows back at once rather than cell by cell
+            enriched = pd.DataFrame(enriched_rows, index=enriched_index, columns=ENRICHED_COLUMNS).astype('string')
+            changed = not df.loc[enriched_index, ENRICHED_COLUMNS].equals(enriched)
+            if changed:
+                df.loc[enriched_index, ENRICHED_COLUMNS] = enriched
+            
+            logger.info(f"Year {year_str}: Enriched {len(enriched_rows)}/{len(index_to_enrich)} entries")
+            
+            # Songs unknown to Genius stay empty: no need to rewrite the file if nothing was found
+            if not changed:
+                logger.info(f"Year {year_str}: No new data, file left unchanged")
+                continue
             
             # Save enriched data
             output_path = DATA_DIR / f"top_singles_{year_str}.csv"